@@ -0,0 +1,56 @@
+import pytest
+
+from web_agent.filesystem.file_system import (
+    TODO_PLACEHOLDER,
+    FileSystem,
+    TodoIndex,
+    _normalize_todo_content,
+)
+
+
+def _make_fs(tmp_path) -> FileSystem:
+    return FileSystem(tmp_path)
+
+
+def test_todo_index_parses_indented_and_compact_checkboxes():
+    content = "# Plan\n- [ ] open page\n  - [x] nested step\n-[X] compact step\n- [ ]\nnot a task [x]"
+    index = TodoIndex.parse(content)
+    assert index.texts == ["open page", "nested step", "compact step"]
+    assert index.statuses == [False, True, True]
+
+
+@pytest.mark.parametrize("content", ["", "   \n", TODO_PLACEHOLDER])
+def test_todo_index_is_empty_for_blank_or_placeholder_content(content):
+    index = TodoIndex.parse(content)
+    assert index.texts == []
+    assert index.statuses == []
+
+
+def test_normalize_todo_content_collapses_repeated_checkboxes():
+    content = "- [x] - [ ] first\n  - [x] -[x] second\n- [ ] third"
+    assert _normalize_todo_content(content) == "- [ ] first\n  - [x] second\n- [ ] third"
+
+
+@pytest.mark.asyncio
+async def test_append_and_replace_normalize_todo(tmp_path):
+    fs = _make_fs(tmp_path)
+    await fs.write_file("todo.md", "- [ ] a\n")
+
+    await fs.append_file("todo.md", "- [x] - [x] b")
+    assert fs.get_todo_contents() == "- [ ] a\n- [x] b"
+
+    await fs.replace_file_str("todo.md", "- [ ] a", "- [x] - [ ] a")
+    assert fs.get_todo_contents() == "- [ ] a\n- [x] b"
+
+
+@pytest.mark.asyncio
+async def test_get_todo_index_reparses_only_after_todo_changes(tmp_path):
+    fs = _make_fs(tmp_path)
+    await fs.write_file("todo.md", "- [ ] a\n- [ ] b")
+    index = fs.get_todo_index()
+    assert fs.get_todo_index() is index
+
+    await fs.write_file("todo.md", "- [ ] a\n- [x] b")
+    reparsed = fs.get_todo_index()
+    assert reparsed is not index
+    assert reparsed.statuses == [False, True]
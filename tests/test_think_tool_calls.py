@@ -2,7 +2,13 @@ import types
 
 import pytest
 
-from web_agent.nodes.think import _tool_call_to_action
+from web_agent.nodes.think import (
+    _assemble_task_context,
+    _render_todo_progress,
+    _tool_call_to_action,
+    _truncate,
+    _url_origin,
+)
 
 
 def test_tool_call_to_action_from_dict():
@@ -36,3 +42,32 @@ def test_tool_call_to_action_handles_missing_values():
     normalized = _tool_call_to_action(empty_call)
     assert normalized == {}
 
+
+def test_url_origin_drops_path_and_query():
+    assert _url_origin("https://example.com/a/b?q=1#frag") == "https://example.com"
+    assert _url_origin("http://localhost:3000/login") == "http://localhost:3000"
+    assert _url_origin("about:blank") == "about://"
+
+
+def test_truncate_keeps_short_text_and_clips_long_text():
+    assert _truncate("short error") == "short error"
+    long_text = "a" * 500 + "b" * 600 + "c" * 200
+    assert _truncate(long_text) == "a" * 500 + "......" + "c" * 200
+
+
+def test_assemble_task_context_orders_todo_action_task_goals():
+    assembled = _assemble_task_context("TASK", "TODO\n", "ACTION\n", "\nGOALS")
+    assert assembled == "TODO\nACTION\n📋 FULL TASK (for reference):\nTASK\nGOALS"
+    assert _assemble_task_context("TASK", "", "ACTION\n", "") == "ACTION\nTASK"
+    assert _assemble_task_context("TASK", "", "", "") == "TASK"
+
+
+def test_render_todo_progress_caps_listed_items_but_counts_all():
+    texts = [f"step {i}" for i in range(8)]
+    statuses = [True] * 7 + [False]
+    rendered, completed, remaining = _render_todo_progress(texts, statuses)
+    assert (completed, remaining) == (7, 1)
+    assert "  ✓ step 4\n" in rendered and "  ✓ step 5\n" not in rendered
+    assert "  ... and 2 more completed\n" in rendered
+    assert "  → step 7\n" in rendered
+    assert _render_todo_progress([], []) == ("", 0, 0)
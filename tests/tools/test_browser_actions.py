@@ -7,12 +7,15 @@ from web_agent.agent.views import ActionResult
 from web_agent.tools.browser_actions import (
 	BrowserToolContext,
 	BrowserToolExecutionError,
+	click,
 	extract_content,
 	navigate,
 	read_file,
 	reset_browser_tool_context,
 	send_keys,
 	set_browser_tool_context,
+	switch_tab,
+	upload_file,
 	write_file,
 )
 
@@ -118,3 +121,34 @@ async def test_send_keys_rejects_empty_input():
 	finally:
 		reset_browser_tool_context(token)
 
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+	('tool', 'method_name', 'args'),
+	[
+		(click, 'click', {'index': 0}),
+		(upload_file, 'upload_file', {'index': 3, 'file_path': ''}),
+		(switch_tab, 'switch', {'tab_id': ''}),
+	],
+)
+async def test_schema_constraints_reject_invalid_args(tool, method_name, args):
+	# Keyed by the Tools method the LangChain tool dispatches to, so the mock is the one that would run
+	underlying = AsyncMock(return_value=ActionResult(extracted_content='ok'))
+	ctx = _make_context(types.SimpleNamespace(**{method_name: underlying}))
+	token = set_browser_tool_context(ctx)
+
+	try:
+		with pytest.raises(ValueError):
+			await tool.ainvoke(args)
+	finally:
+		reset_browser_tool_context(token)
+
+	underlying.assert_not_awaited()
+
+
+def test_tool_schemas_advertise_constraints():
+	assert click.args['index']['minimum'] == 1
+	assert upload_file.args['index']['minimum'] == 0
+	assert upload_file.args['file_path']['minLength'] == 1
+	assert switch_tab.args['tab_id']['minLength'] == 1
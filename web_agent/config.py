@@ -26,6 +26,8 @@ class Settings(BaseSettings):
     llm_temperature: float = 0.7
     max_input_tokens: int = 128000  # gpt-4o context limit
     max_output_tokens: int = 16000
+    max_clickable_elements_length: int = 40000  # Upper bound on DOM chars sent to THINK's LLM
+    clickable_chars_per_element: int = 0  # Opt-in: shrink the DOM budget to 4000 + N chars per interactive element (0 = always use the cap)
 
     # OpenAI Settings
     openai_api_key: Optional[str] = None
@@ -43,6 +45,7 @@ class Settings(BaseSettings):
     browser_timeout: int = 30000  # milliseconds
     navigation_timeout: int = 30000  # milliseconds
     action_timeout: int = 5000  # milliseconds
+    per_action_timeout_s: float = 120.0  # seconds before a single ACT tool call is abandoned
     cdp_timeout: int = 30000  # CDP websocket timeout
 
     # Browser Provider Selection
@@ -65,6 +68,8 @@ class Settings(BaseSettings):
 
     # Logging
     log_level: str = "INFO"
+    verbose_act_logging: bool = False  # Print ACT node banners to stdout
+    verbose_think_logging: bool = False  # Print THINK prompt/response banners to stdout
 
     # browser compatibility settings (used by profile.py)
     IN_DOCKER: bool = False
@@ -5,6 +5,7 @@ import re
 import shutil
 from abc import ABC, abstractmethod
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -15,6 +16,25 @@ from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
 
 INVALID_FILENAME_ERROR_MESSAGE = 'Error: Invalid filename format. Must be alphanumeric with supported extension.'
 DEFAULT_FILE_SYSTEM_PATH = 'browseruse_agent_data'
+TODO_PLACEHOLDER = '[empty todo.md, fill it when applicable]'
+
+# One todo.md checklist line: "- [ ] step" / "- [x] step"
+_TODO_LINE_RE = re.compile(r'^\s*-\s*\[(?P<mark>[xX ])\]\s*(?P<text>.*)$')
+# Malformed checklist line with repeated checkboxes (e.g. "- [x] - [ ] step"), fixed up at write time.
+# Multiline so the whole file is fixed in one scan; [^\S\n] keeps each match within a single line
+_TODO_REPEATED_CHECKBOX_RE = re.compile(
+	r'^(?P<indent>[^\S\n]*)(?P<boxes>(?:-[^\S\n]*\[[xX ]\][^\S\n]*){2,})(?P<text>.*)$', re.MULTILINE
+)
+
+
+def _collapse_checkboxes(match: re.Match) -> str:
+	mark = ' ' if '[ ]' in match['boxes'] else 'x'
+	return f"{match['indent']}- [{mark}] {match['text'].strip()}"
+
+
+def _normalize_todo_content(content: str) -> str:
+	"""Collapse repeated checkboxes on todo.md lines into one; an unchecked box wins over a checked one"""
+	return _TODO_REPEATED_CHECKBOX_RE.sub(_collapse_checkboxes, content)
 
 
 class FileSystemError(Exception):
@@ -206,6 +226,38 @@ class DocxFile(BaseFile):
 			await asyncio.get_event_loop().run_in_executor(executor, lambda: self.sync_to_disk_sync(path))
 
 
+@dataclass(slots=True)
+class TodoIndex:
+	"""Checklist items parsed from todo.md, as parallel arrays (one entry per checkbox line)"""
+
+	content: str
+	statuses: list[bool] = field(default_factory=list)  # True if the item is checked
+	texts: list[str] = field(default_factory=list)  # Item text without its checkbox
+
+	@classmethod
+	def parse(cls, content: str) -> 'TodoIndex':
+		"""Parse todo.md content in a single pass over its lines"""
+		index = cls(content=content)
+		if not content.strip() or content.strip() == TODO_PLACEHOLDER:
+			return index
+
+		# Bound methods hoisted out of the per-line loop
+		match_line = _TODO_LINE_RE.match
+		add_status, add_text = index.statuses.append, index.texts.append
+		for line in content.split('\n'):
+			if '[' not in line:
+				continue  # Headings, prose and blank lines can't be checklist items - skip the regex
+			match = match_line(line)
+			if not match:
+				continue
+			text = match['text'].strip()
+			if not text:
+				continue
+			add_status(match['mark'] != ' ')
+			add_text(text)
+		return index
+
+
 class FileSystemState(BaseModel):
 	"""Serializable state of the file system"""
 
@@ -247,6 +299,7 @@ class FileSystem:
 			self._create_default_files()
 
 		self.extracted_content_count = 0
+		self._todo_index: TodoIndex | None = None
 
 	def get_allowed_extensions(self) -> list[str]:
 		"""Get allowed extensions"""
@@ -434,6 +487,10 @@ class FileSystem:
 				file_obj = file_class(name=name_without_ext)
 				self.files[full_filename] = file_obj  # Use full filename as key
 
+			# Keep todo.md to one checkbox per line so it can be parsed with a single match per line
+			if full_filename == 'todo.md':
+				content = _normalize_todo_content(content)
+
 			# Use file-specific write method
 			await file_obj.write(content, self.data_dir)
 			return f'Data written to file {full_filename} successfully.'
@@ -452,7 +509,11 @@ class FileSystem:
 			return f"File '{full_filename}' not found."
 
 		try:
-			await file_obj.append(content, self.data_dir)
+			if full_filename == 'todo.md':
+				# Normalize the combined content: the appended text can extend an existing line
+				await file_obj.write(_normalize_todo_content(file_obj.read() + content), self.data_dir)
+			else:
+				await file_obj.append(content, self.data_dir)
 			return f'Data appended to file {full_filename} successfully.'
 		except FileSystemError as e:
 			return str(e)
@@ -474,6 +535,8 @@ class FileSystem:
 		try:
 			content = file_obj.read()
 			content = content.replace(old_str, new_str)
+			if full_filename == 'todo.md':
+				content = _normalize_todo_content(content)
 			await file_obj.write(content, self.data_dir)
 			return f'Successfully replaced all occurrences of "{old_str}" with "{new_str}" in file {full_filename}'
 		except FileSystemError as e:
@@ -569,6 +632,14 @@ class FileSystem:
 		todo_file = self.get_file('todo.md')
 		return todo_file.read() if todo_file else ''
 
+	def get_todo_index(self) -> TodoIndex:
+		"""Parsed todo.md checklist, re-parsed only when the todo.md content has changed"""
+		content = self.get_todo_contents()
+		index = self._todo_index
+		if index is None or (index.content is not content and index.content != content):
+			index = self._todo_index = TodoIndex.parse(content)
+		return index
+
 	def get_todo_status(self) -> dict[str, Any]:
 		"""
 		Parse todo.md to extract completion status.
@@ -584,9 +655,10 @@ class FileSystem:
 				"status_summary": str  # Human-readable summary
 			}
 		"""
-		todo_content = self.get_todo_contents()
+		todo_index = self.get_todo_index()
+		todo_content = todo_index.content
 		
-		if not todo_content or todo_content == '[empty todo.md, fill it when applicable]':
+		if not todo_content or todo_content == TODO_PLACEHOLDER:
 			return {
 				"total_items": 0,
 				"completed_items": 0,
@@ -596,20 +668,9 @@ class FileSystem:
 				"status_summary": "No todo.md file or empty"
 			}
 		
-		# Parse markdown checkboxes
-		lines = todo_content.split('\n')
-		total_items = 0
-		completed_items = 0
-		
-		for line in lines:
-			line_stripped = line.strip()
-			# Match both - [x] and - [X] (completed)
-			if line_stripped.startswith('- [x]') or line_stripped.startswith('- [X]'):
-				completed_items += 1
-				total_items += 1
-			# Match - [ ] (pending)
-			elif line_stripped.startswith('- [ ]'):
-				total_items += 1
+		# Checkbox states come from the cached todo.md index (one regex match per line covers both - [x] and - [ ])
+		total_items = len(todo_index.statuses)
+		completed_items = sum(todo_index.statuses)
 		
 		pending_items = total_items - completed_items
 		completion_ratio = completed_items / total_items if total_items > 0 else 0.0
@@ -113,3 +113,20 @@ def get_llm(
             f"Supported providers: openai, google (gemini), anthropic (claude)"
         )
 
+
+# Shared LLM built from settings (created on first use) - node code calls this
+# every step, so reuse one client instead of re-initializing it each time
+_shared_llm_instance = None
+
+
+def get_shared_llm() -> Union[ChatOpenAI, ChatGoogleGenerativeAI, ChatAnthropic]:
+    """
+    Get the shared LLM instance configured from settings
+
+    Returns:
+        LLM instance created by get_llm() with default arguments
+    """
+    global _shared_llm_instance
+    if _shared_llm_instance is None:
+        _shared_llm_instance = get_llm()
+    return _shared_llm_instance
@@ -16,7 +16,9 @@ The LLM will:
 
 We only add lightweight goal tracking for PAGE STATE detection to prevent loops.
 """
+import json
 import logging
+import re
 from typing import Dict, Any
 from web_agent.state import QAAgentState
 from web_agent.llm import get_llm
@@ -24,6 +26,9 @@ from langchain_core.messages import SystemMessage, HumanMessage
 
 logger = logging.getLogger(__name__)
 
+# Goal JSON object in the planner response (may be wrapped in prose or a code fence)
+_GOALS_JSON_RE = re.compile(r'\{[\s\S]*"goals"[\s\S]*\}')
+
 
 async def plan_node(state: QAAgentState) -> Dict[str, Any]:
 	"""
@@ -150,16 +155,18 @@ Extract goals now:"""
 		response_text = response.content if hasattr(response, 'content') else str(response)
 
 		# Parse JSON
-		import json
-		import re
-
-		json_match = re.search(r'\{[\s\S]*"goals"[\s\S]*\}', response_text)
+		json_match = _GOALS_JSON_RE.search(response_text)
 		if json_match:
 			try:
 				plan_data = json.loads(json_match.group(0))
 				goals = plan_data.get("goals", [])
 
 				if goals:
+					# THINK matches signals case-insensitively against URL/title every step -
+					# lowercase them once here so it doesn't have to
+					for goal in goals:
+						goal["completion_signals"] = [str(signal).lower() for signal in goal.get("completion_signals", [])]
+
 					logger.info(f"PLAN: Extracted {len(goals)} goals for page state tracking:")
 					for i, goal in enumerate(goals, 1):
 						logger.info(f"  {i}. [{goal['id']}] {goal['description']}")
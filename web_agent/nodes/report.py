@@ -18,7 +18,6 @@ from typing import Dict, Any, List
 from datetime import datetime
 from pathlib import Path
 from web_agent.state import QAAgentState
-from web_agent.config import settings
 from web_agent.utils.browser_manager import cleanup_browser_session
 
 logger = logging.getLogger(__name__)
@@ -74,8 +73,14 @@ def _extract_final_result_from_history(history: List[Dict[str, Any]]) -> str:
 
 	# If nothing found, summarize from history
 	if not final_result_parts:
-		total_actions = sum(1 for e in history if e.get("node") == "act")
-		total_steps = len([e for e in history if e.get("node") == "think"])
+		# Count act and think entries in a single pass over history
+		total_actions = total_steps = 0
+		for e in history:
+			node = e.get("node")
+			if node == "act":
+				total_actions += 1
+			elif node == "think":
+				total_steps += 1
 		final_result_parts.append(
 			f"Executed {total_actions} actions across {total_steps} steps. "
 			"No explicit completion result found in history."
@@ -8,12 +8,18 @@ This node:
 4. Generates verification results
 """
 import logging
+import re
 from typing import Dict, Any
 from web_agent.state import QAAgentState
-from web_agent.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Error-like messages reported via extracted_content; IGNORECASE avoids lowercasing the whole content
+_ERROR_INDICATOR_RE = re.compile(
+    r"not available|page may have changed|try refreshing|failed|error|not found|invalid",
+    re.IGNORECASE,
+)
+
 
 async def verify_node(state: QAAgentState) -> Dict[str, Any]:
     """
@@ -45,19 +51,7 @@ async def verify_node(state: QAAgentState) -> Dict[str, Any]:
             extracted_content = result.get("extracted_content", "")
 
             # Check if extracted_content contains error-like messages
-            content_looks_like_error = False
-            if extracted_content:
-                error_indicators = [
-                    "not available",
-                    "page may have changed",
-                    "Try refreshing",
-                    "failed",
-                    "error",
-                    "not found",
-                    "invalid",
-                ]
-                content_lower = extracted_content.lower()
-                content_looks_like_error = any(indicator in content_lower for indicator in error_indicators)
+            content_looks_like_error = bool(extracted_content) and _ERROR_INDICATOR_RE.search(extracted_content) is not None
 
             # Action status
             if success and not error and not content_looks_like_error:
@@ -1,5 +1,7 @@
 import importlib.resources
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
 from typing import TYPE_CHECKING, Literal, Optional
 
 from web_agent.dom.views import NodeType, SimplifiedNode
@@ -13,6 +15,14 @@ if TYPE_CHECKING:
 	from web_agent.filesystem.file_system import FileSystem
 
 
+@lru_cache(maxsize=4)
+def _read_prompt_template(template_filename: str) -> str:
+	"""Read a prompt template next to this file once per process."""
+	prompt_file = Path(__file__).parent / template_filename
+	with prompt_file.open('r', encoding='utf-8') as f:
+		return f.read()
+
+
 class SystemPrompt:
 	def __init__(
 		self,
@@ -48,11 +58,8 @@ class SystemPrompt:
 			else:
 				template_filename = 'system_prompt_no_thinking.md'
 
-			# Load from same directory as this file
-			from pathlib import Path
-			prompt_file = Path(__file__).parent / template_filename
-			with prompt_file.open('r', encoding='utf-8') as f:
-				self.prompt_template = f.read()
+			# Load from same directory as this file (cached per template)
+			self.prompt_template = _read_prompt_template(template_filename)
 		except Exception as e:
 			raise RuntimeError(f'Failed to load system prompt template: {e}')
 
@@ -4,7 +4,7 @@ QA Agent State Definition - LangGraph v1 Compatible
 Uses TypedDict with Annotated reducers for state management following LangGraph v1 best practices.
 No hardcoded values - all configurable via settings or state initialization.
 """
-from typing import TypedDict, List, Dict, Any, Optional
+from typing import TypedDict, List, Dict, Any, FrozenSet, Optional, Tuple
 from typing_extensions import Annotated
 import operator
 
@@ -37,11 +37,13 @@ class QAAgentState(TypedDict):
     # ========== Current Page State ==========
     current_url: Optional[str]  # Current page URL
     previous_url: Optional[str]  # Previous URL for change detection
+    last_think_url: Optional[str]  # URL seen by the last THINK step (retry comparison without scanning history)
+    last_think_action_key: Optional[Tuple[str, Any]]  # (action_type, index) of the last THINK step's first action
     current_title: Optional[str]  # Current page title
     previous_element_count: Optional[int]  # Previous element count for change detection
-    previous_element_ids: Optional[List[int]]  # Phase 1 & 2: Previous element IDs for adaptive detection
+    previous_element_ids: Optional[FrozenSet[int]]  # Phase 1 & 2: Previous element IDs for adaptive detection
     action_context: Optional[Dict[str, Any]]  # Phase 1: Action → element relationship context
-    new_element_ids: Optional[List[int]]  # Phase 1: New elements that appeared after last action
+    new_element_ids: Optional[FrozenSet[int]]  # Phase 1: New elements that appeared after last action
     
     # ========== Tab Management ==========
     tab_count: int  # Number of open tabs
@@ -57,6 +59,7 @@ class QAAgentState(TypedDict):
     completed_goals: Annotated[List[str], operator.add]  # Accumulated completed goal IDs
     current_goal_index: int  # Current goal index
     current_goal: Optional[str]  # Current goal description
+    last_goal_check: Optional[Tuple[str, str, str]]  # (goal_id, url, title) last found incomplete - skip re-checking
     
     # ========== FileSystem State (CRITICAL for todo.md persistence) ==========
     file_system_state: Optional[FileSystemState]  # Persisted FileSystem state
@@ -72,8 +75,7 @@ class QAAgentState(TypedDict):
     history: Annotated[List[Dict[str, Any]], operator.add]  # Accumulated execution history
     
     # ========== Browser State Cache ==========
-    browser_state_summary: Optional[Dict[str, Any]]  # Cached browser state summary
-    dom_selector_map: Optional[Dict[int, Any]]  # Cached DOM selector map
+    dom_version: Optional[int]  # Version of ACT's browser state cached in the session registry
     fresh_state_available: bool  # Flag indicating fresh state is available
     page_changed: bool  # Flag indicating page changed
     
@@ -161,6 +163,8 @@ def create_initial_state(
         # Current page state
         "current_url": None,
         "previous_url": None,
+        "last_think_url": None,
+        "last_think_action_key": None,
         "current_title": None,
         "previous_element_count": None,
         "previous_element_ids": None,  # Phase 1 & 2: Track element IDs for adaptive detection
@@ -179,6 +183,7 @@ def create_initial_state(
         "completed_goals": [],  # Reducer will accumulate
         "current_goal_index": 0,
         "current_goal": None,
+        "last_goal_check": None,
         
         # FileSystem state (CRITICAL for todo.md persistence)
         "file_system_state": None,  # Created in think_node, persisted across steps
@@ -192,8 +197,7 @@ def create_initial_state(
         "history": [],  # Reducer will accumulate
         
         # Browser state cache
-        "browser_state_summary": None,
-        "dom_selector_map": None,
+        "dom_version": None,
         "fresh_state_available": False,
         "page_changed": False,
         
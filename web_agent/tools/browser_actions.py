@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import logging
+import types
 from contextvars import ContextVar, Token
 from dataclasses import dataclass
-from typing import Any, Iterable
+from typing import Annotated, Any, Iterable
 
 from langchain_core.tools import tool
+from pydantic import Field
 
 from web_agent.agent.views import ActionResult
 from web_agent.browser import BrowserSession
@@ -20,7 +22,7 @@ class BrowserToolExecutionError(RuntimeError):
 	"""Raised when a browser tool cannot be executed due to missing context or dependencies."""
 
 
-@dataclass
+@dataclass(slots=True)
 class BrowserToolContext:
 	"""Execution context injected before running LangChain tools."""
 
@@ -34,34 +36,47 @@ class BrowserToolContext:
 
 _CONTEXT: ContextVar[BrowserToolContext | None] = ContextVar('browser_tool_context', default=None)
 
-# Mapping between tool names exposed to the LLM and Tools service method names
-ACTION_NAME_MAP = {
-	'select_dropdown': 'select_dropdown',
+# Tool names exposed to the LLM that differ from their Tools service method names
+# (every other tool name is the method name itself)
+ACTION_NAME_MAP = types.MappingProxyType({
 	'toggle_checkbox': 'checkbox',
 	'extract_content': 'extract',
-	'wait': 'wait',
-	'scroll': 'scroll',
-	'screenshot': 'screenshot',
 	'switch_tab': 'switch',
 	'close_tab': 'close',
-	'upload_file': 'upload_file',
-	'write_file': 'write_file',
-	'read_file': 'read_file',
-	'send_keys': 'send_keys',
 	'evaluate_javascript': 'evaluate',
-	'done': 'done',
-	'go_back': 'go_back',
 	'input_text': 'input',
-	'search': 'search',
-	'navigate': 'navigate',
-	'click': 'click',
-	'find_text': 'find_text',
-}
+})
 
 FILE_SYSTEM_ACTIONS = {'extract', 'write_file', 'read_file', 'replace_file', 'done'}
 AVAILABLE_FILE_ACTIONS = {'read_file', 'upload_file'}
 PAGE_EXTRACTION_ACTIONS = {'extract'}
 
+# Context injections a Tools method needs (bit flags)
+_NEEDS_FILE_SYSTEM = 1
+_NEEDS_AVAILABLE_FILES = 2
+_NEEDS_PAGE_EXTRACTION = 4
+_NEEDS_SENSITIVE_DATA = 8
+
+
+def _action_flags(action_name: str) -> int:
+	flags = 0
+	if action_name in FILE_SYSTEM_ACTIONS or action_name in PAGE_EXTRACTION_ACTIONS:
+		flags |= _NEEDS_FILE_SYSTEM
+	if action_name in AVAILABLE_FILE_ACTIONS:
+		flags |= _NEEDS_AVAILABLE_FILES
+	if action_name in PAGE_EXTRACTION_ACTIONS:
+		flags |= _NEEDS_PAGE_EXTRACTION
+	if action_name == 'input':
+		flags |= _NEEDS_SENSITIVE_DATA
+	return flags
+
+
+def _resolve_action(action_key: str) -> tuple[str, int]:
+	"""Return the Tools method name and injection flags for an LLM tool name."""
+	action_name = ACTION_NAME_MAP.get(action_key, action_key)
+	return action_name, _action_flags(action_name)
+
+
 
 def set_browser_tool_context(ctx: BrowserToolContext) -> Token:
 	"""Set the runtime context for tool execution."""
@@ -83,36 +98,36 @@ def get_browser_tool_context() -> BrowserToolContext:
 async def _execute_action(action_key: str, **action_kwargs: Any) -> ActionResult:
 	"""Execute the corresponding Tools action with the active context."""
 	ctx = get_browser_tool_context()
-	action_name = ACTION_NAME_MAP.get(action_key, action_key)
+	action_name, flags = _ACTION_TABLE.get(action_key) or _resolve_action(action_key)
 
-	if not hasattr(ctx.tools, action_name):
+	tool_callable = getattr(ctx.tools, action_name, None)
+	if tool_callable is None:
 		raise BrowserToolExecutionError(f'Unsupported action: {action_name}')
 
-	injected_kwargs: dict[str, Any] = {'browser_session': ctx.browser_session}
-
-	if action_name in FILE_SYSTEM_ACTIONS:
-		if ctx.file_system is None:
-			raise BrowserToolExecutionError(f'Action "{action_name}" requires file system access.')
-		injected_kwargs['file_system'] = ctx.file_system
+	if not flags:
+		# Plain browser actions (click, scroll, wait, ...) only need the session
+		result = await tool_callable(**action_kwargs, browser_session=ctx.browser_session)
+	else:
+		injected_kwargs: dict[str, Any] = {'browser_session': ctx.browser_session}
 
-	if action_name in AVAILABLE_FILE_ACTIONS:
-		injected_kwargs['available_file_paths'] = ctx.available_file_paths or []
-
-	if action_name in PAGE_EXTRACTION_ACTIONS:
-		if ctx.page_extraction_llm is None:
-			raise BrowserToolExecutionError('Extract actions require a page_extraction_llm.')
-		injected_kwargs['page_extraction_llm'] = ctx.page_extraction_llm
-		if 'file_system' not in injected_kwargs:
+		if flags & _NEEDS_FILE_SYSTEM:
 			if ctx.file_system is None:
-				raise BrowserToolExecutionError('Extract actions require file system access.')
+				raise BrowserToolExecutionError(f'Action "{action_name}" requires file system access.')
 			injected_kwargs['file_system'] = ctx.file_system
 
-	if action_name == 'input' and ctx.sensitive_data:
-		injected_kwargs['has_sensitive_data'] = True
-		injected_kwargs['sensitive_data'] = ctx.sensitive_data
+		if flags & _NEEDS_AVAILABLE_FILES:
+			injected_kwargs['available_file_paths'] = ctx.available_file_paths or []
 
-	tool_callable = getattr(ctx.tools, action_name)
-	result = await tool_callable(**action_kwargs, **injected_kwargs)
+		if flags & _NEEDS_PAGE_EXTRACTION:
+			if ctx.page_extraction_llm is None:
+				raise BrowserToolExecutionError('Extract actions require a page_extraction_llm.')
+			injected_kwargs['page_extraction_llm'] = ctx.page_extraction_llm
+
+		if flags & _NEEDS_SENSITIVE_DATA and ctx.sensitive_data:
+			injected_kwargs['has_sensitive_data'] = True
+			injected_kwargs['sensitive_data'] = ctx.sensitive_data
+
+		result = await tool_callable(**action_kwargs, **injected_kwargs)
 
 	if isinstance(result, ActionResult):
 		return result
@@ -124,9 +139,10 @@ async def _execute_action(action_key: str, **action_kwargs: Any) -> ActionResult
 	raise BrowserToolExecutionError(f'Unexpected result type from action "{action_name}": {type(result)}')
 
 
-def _ensure_positive_index(index: int, action: str) -> None:
-	if index < 0:
-		raise ValueError(f'{action} requires a non-negative element index.')
+# Argument bounds enforced by the @tool input schema (and advertised to the LLM in it)
+_ElementIndex = Annotated[int, Field(ge=0)]
+_ClickIndex = Annotated[int, Field(ge=1)]
+_NonEmptyStr = Annotated[str, Field(min_length=1)]
 
 
 @tool
@@ -155,33 +171,26 @@ async def wait(seconds: float = 3.0) -> ActionResult:
 
 
 @tool
-async def click(index: int) -> ActionResult:
+async def click(index: _ClickIndex) -> ActionResult:
 	"""Click a DOM element referenced by its index in the DOM snapshot."""
-	if index <= 0:
-		raise ValueError('click requires an element index greater than 0.')
 	return await _execute_action('click', index=index)
 
 
 @tool
-async def input_text(index: int, text: str, clear: bool = True) -> ActionResult:
+async def input_text(index: _ElementIndex, text: str, clear: bool = True) -> ActionResult:
 	"""Type text into an input, textarea, or contentEditable element."""
-	_ensure_positive_index(index, 'input_text')
 	return await _execute_action('input_text', index=index, text=text, clear=clear)
 
 
 @tool
-async def select_dropdown(index: int, option_text: str) -> ActionResult:
+async def select_dropdown(index: _ElementIndex, option_text: _NonEmptyStr) -> ActionResult:
 	"""Select an option from a dropdown/select element by its visible text."""
-	_ensure_positive_index(index, 'select_dropdown')
-	if not option_text:
-		raise ValueError('select_dropdown requires a non-empty option_text value.')
 	return await _execute_action('select_dropdown', index=index, text=option_text)
 
 
 @tool
-async def toggle_checkbox(index: int, checked: bool | None = True) -> ActionResult:
+async def toggle_checkbox(index: _ElementIndex, checked: bool | None = True) -> ActionResult:
 	"""Ensure a checkbox/radio element is checked, unchecked, or toggled (checked=None)."""
-	_ensure_positive_index(index, 'toggle_checkbox')
 	return await _execute_action('toggle_checkbox', index=index, checked=checked)
 
 
@@ -239,40 +248,31 @@ async def scroll(direction: str = 'down', pages: float = 1.0, element_index: int
 
 
 @tool
-async def switch_tab(tab_id: str) -> ActionResult:
+async def switch_tab(tab_id: _NonEmptyStr) -> ActionResult:
 	"""Switch to an existing tab using its 4-character identifier (shown in browser state)."""
-	if not tab_id:
-		raise ValueError('switch_tab requires a tab_id (last 4 characters of the target id).')
 	return await _execute_action('switch_tab', tab_id=tab_id[-4:])
 
 
 @tool
-async def close_tab(tab_id: str) -> ActionResult:
+async def close_tab(tab_id: _NonEmptyStr) -> ActionResult:
 	"""Close a browser tab by its identifier."""
-	if not tab_id:
-		raise ValueError('close_tab requires a tab_id.')
 	return await _execute_action('close_tab', tab_id=tab_id[-4:])
 
 
 @tool
-async def upload_file(index: int, file_path: str) -> ActionResult:
+async def upload_file(index: _ElementIndex, file_path: _NonEmptyStr) -> ActionResult:
 	"""Upload a local file through the file input near the specified element index."""
-	_ensure_positive_index(index, 'upload_file')
-	if not file_path:
-		raise ValueError('upload_file requires file_path to be provided.')
 	return await _execute_action('upload_file', index=index, path=file_path)
 
 
 @tool
 async def write_file(
-	file_name: str,
+	file_name: _NonEmptyStr,
 	content: str,
 	append: bool = False,
 	trailing_newline: bool = True,
 ) -> ActionResult:
 	"""Write text content to a workspace file. Set append=True to append instead of overwrite."""
-	if not file_name:
-		raise ValueError('write_file requires a file_name.')
 	return await _execute_action(
 		'write_file',
 		file_name=file_name,
@@ -283,18 +283,14 @@ async def write_file(
 
 
 @tool
-async def read_file(file_name: str) -> ActionResult:
+async def read_file(file_name: _NonEmptyStr) -> ActionResult:
 	"""Read the contents of a workspace or downloaded file."""
-	if not file_name:
-		raise ValueError('read_file requires a file_name.')
 	return await _execute_action('read_file', file_name=file_name)
 
 
 @tool
-async def send_keys(keys: str) -> ActionResult:
+async def send_keys(keys: _NonEmptyStr) -> ActionResult:
 	"""Send raw keyboard input to the active page (e.g., 'Enter', 'Escape')."""
-	if not keys:
-		raise ValueError('send_keys requires a non-empty keys string.')
 	return await _execute_action('send_keys', keys=keys)
 
 
@@ -340,8 +336,15 @@ BROWSER_TOOLS = [
 	done,
 ]
 
+# Tool name (as the LLM calls it) -> tool
+BROWSER_TOOLS_BY_NAME = {t.name: t for t in BROWSER_TOOLS}
+
+# Tool name -> (Tools method name, injection flags), resolved once at import
+_ACTION_TABLE: dict[str, tuple[str, int]] = {name: _resolve_action(name) for name in BROWSER_TOOLS_BY_NAME}
+
 __all__ = [
 	'BROWSER_TOOLS',
+	'BROWSER_TOOLS_BY_NAME',
 	'BrowserToolContext',
 	'BrowserToolExecutionError',
 	'get_browser_tool_context',
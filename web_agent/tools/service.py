@@ -1781,6 +1781,19 @@ Validated Code (after quote fixing):
 # Alias for backwards compatibility
 Controller = Tools
 
+# Shared Tools instance (created on first use). Tools only holds the action
+# registry, so it is safe to reuse across steps and sessions.
+_tools_instance: Tools | None = None
+
+
+def get_tools() -> Tools:
+	"""Return the shared Tools instance, creating it on first use."""
+	global _tools_instance
+	if _tools_instance is None:
+		logger.info('Initializing browser Tools')
+		_tools_instance = Tools()
+	return _tools_instance
+
 
 class CodeAgentTools(Tools[Context]):
 	"""Specialized Tools for CodeAgent agent optimized for Python-based browser automation.
@@ -8,6 +8,10 @@ from .session_registry import (
 	get_session,
 	list_sessions,
 	session_count,
+	cache_browser_state,
+	get_cached_browser_state,
+	cache_file_system,
+	get_cached_file_system,
 )
 from .browser_utils import _log_pretty_path, _log_pretty_url, is_new_tab_page, time_execution_sync, time_execution_async, logger, match_url_with_domain_pattern
 from .singleton import singleton
@@ -22,6 +26,10 @@ __all__ = [
 	"get_session",
 	"list_sessions",
 	"session_count",
+	"cache_browser_state",
+	"get_cached_browser_state",
+	"cache_file_system",
+	"get_cached_file_system",
 	"_log_pretty_path",
 	"_log_pretty_url",
 	"is_new_tab_page",
@@ -164,12 +164,9 @@ Create steps the way a QA engineer would execute them manually on the website.""
         logger.info(f"llm_create_todo_structure: LLM response received: title='{response.title}', goal='{response.goal[:50]}...', steps={len(response.steps)}")
         
         # Build todo.md content matching browser format exactly
-        content = f"# {response.title}\n\n"
-        content += f"## Goal: {response.goal}\n\n"
-        content += "## Tasks:\n"
-        
-        for step in response.steps:
-            content += f"- [ ] {step}\n"
+        parts = [f"# {response.title}\n\n", f"## Goal: {response.goal}\n\n", "## Tasks:\n"]
+        parts.extend(f"- [ ] {step}\n" for step in response.steps)
+        content = "".join(parts)
         
         logger.info(f"llm_create_todo_structure: ✅ LLM created todo.md structure (browser format): {len(response.steps)} steps - Title: {response.title[:50]}")
         logger.debug(f"llm_create_todo_structure: Generated content length: {len(content)} chars")
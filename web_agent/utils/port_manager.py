@@ -1,10 +1,11 @@
 """
 Port Management Utilities
 
-Provides utilities for checking port availability and finding available ports.
+Provides utilities for checking port availability and allocating free ports.
 Used by browser providers to handle port conflicts.
 """
 import socket
+import sys
 import logging
 from typing import Optional
 
@@ -23,36 +24,41 @@ def check_port_available(port: int, host: str = 'localhost') -> bool:
 		True if port is available, False if already in use
 	"""
 	try:
+		# Binding is the actual availability test and returns immediately, unlike a
+		# connect probe (which also reports bound-but-not-listening ports as free).
+		# SO_REUSEADDR so ports lingering in TIME_WAIT still count as available. On Windows
+		# SO_REUSEADDR would let the bind succeed on a port another socket is listening on,
+		# so take the port exclusively there instead.
 		with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-			s.settimeout(1)
-			result = s.connect_ex((host, port))
-			return result != 0  # Port is available if connection fails
+			if sys.platform == "win32":
+				s.setsockopt(socket.SOL_SOCKET, socket.SO_EXCLUSIVEADDRUSE, 1)
+			else:
+				s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+			s.bind((host, port))
+			return True
+	except OSError:
+		return False  # Port is in use (EADDRINUSE) or not bindable
 	except Exception as e:
-		logger.debug(f"Error checking port {port}: {e}")
+		logger.debug("Error checking port %d: %s", port, e)
 		return False
 
 
-def find_available_port(start_port: int, max_attempts: int = 10, host: str = 'localhost') -> Optional[int]:
+def allocate_ephemeral_port(host: str = 'localhost') -> int:
 	"""
-	Find an available port starting from start_port.
+	Let the OS pick a free port in a single bind call.
+	
+	The socket is closed before returning, so another process could in principle
+	claim the port before the caller binds it.
 	
 	Args:
-		start_port: Starting port number
-		max_attempts: Maximum number of ports to try
 		host: Host address (default: 'localhost')
 		
 	Returns:
-		Available port number, or None if no port found
+		Port number that was free at the time of the call
 	"""
-	for i in range(max_attempts):
-		port = start_port + i
-		if check_port_available(port, host):
-			logger.debug(f"Found available port: {port}")
-			return port
-		logger.debug(f"Port {port} is in use, trying next...")
-	
-	logger.warning(f"No available port found in range {start_port}-{start_port + max_attempts - 1}")
-	return None
+	with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+		s.bind((host, 0))
+		return s.getsockname()[1]
 
 
 def get_available_cdp_port(requested_port: Optional[int] = None, default_port: int = 9222) -> int:
@@ -72,13 +78,13 @@ def get_available_cdp_port(requested_port: Optional[int] = None, default_port: i
 		logger.info(f"CDP port {port} is available")
 		return port
 	
-	logger.warning(f"CDP port {port} is in use, searching for alternative...")
-	alternative = find_available_port(port + 1, max_attempts=10)
-	if alternative:
-		logger.info(f"Using alternative CDP port: {alternative}")
-		return alternative
-	
-	raise RuntimeError(f"Could not find available CDP port. Port {port} is in use and no alternatives found.")
+	logger.warning(f"CDP port {port} is in use, allocating an alternative...")
+	try:
+		alternative = allocate_ephemeral_port()
+	except OSError as e:
+		raise RuntimeError(f"Could not find available CDP port. Port {port} is in use and no alternatives found.") from e
+	logger.info(f"Using alternative CDP port: {alternative}")
+	return alternative
 
 
 def get_available_streaming_port(requested_port: Optional[int] = None, default_port: int = 8080) -> int:
@@ -98,11 +104,11 @@ def get_available_streaming_port(requested_port: Optional[int] = None, default_p
 		logger.info(f"Streaming port {port} is available")
 		return port
 	
-	logger.warning(f"Streaming port {port} is in use, searching for alternative...")
-	alternative = find_available_port(port + 1, max_attempts=10)
-	if alternative:
-		logger.info(f"Using alternative streaming port: {alternative}")
-		return alternative
-	
-	raise RuntimeError(f"Could not find available streaming port. Port {port} is in use and no alternatives found.")
+	logger.warning(f"Streaming port {port} is in use, allocating an alternative...")
+	try:
+		alternative = allocate_ephemeral_port()
+	except OSError as e:
+		raise RuntimeError(f"Could not find available streaming port. Port {port} is in use and no alternatives found.") from e
+	logger.info(f"Using alternative streaming port: {alternative}")
+	return alternative
 
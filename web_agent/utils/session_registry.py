@@ -5,13 +5,22 @@ Manages browser session instances to keep state serializable for LangGraph.
 State stores session_id (string), this registry maps IDs to actual BrowserSession objects.
 """
 import logging
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 # Global session registry - maps session_id -> BrowserSession
 _SESSION_REGISTRY: Dict[str, any] = {}
 
+# BrowserStateSummary ACT fetched after its actions - maps session_id -> (dom_version, browser_state)
+# THINK picks it up by dom_version instead of re-fetching the DOM ACT just extracted; the state
+# (selector map included) is kept out of LangGraph state so it is not copied between nodes
+_BROWSER_STATE_CACHE: Dict[str, Tuple[int, any]] = {}
+
+# FileSystem instance per session - maps session_id -> (file_system, file_system_state it last emitted)
+# Lets THINK reuse the live instance instead of re-syncing every file to disk via from_state()
+_FILE_SYSTEM_CACHE: Dict[str, Tuple[any, any]] = {}
+
 
 def register_session(session_id: str, session: any) -> None:
 	"""
@@ -48,6 +57,8 @@ def unregister_session(session_id: str) -> None:
 	Args:
 		session_id: Session identifier to remove
 	"""
+	_FILE_SYSTEM_CACHE.pop(session_id, None)
+	_BROWSER_STATE_CACHE.pop(session_id, None)
 	if session_id in _SESSION_REGISTRY:
 		del _SESSION_REGISTRY[session_id]
 		logger.info(f"Unregistered browser session: {session_id}")
@@ -63,3 +74,69 @@ def list_sessions() -> list[str]:
 def session_count() -> int:
 	"""Get count of active sessions"""
 	return len(_SESSION_REGISTRY)
+
+
+def cache_browser_state(session_id: str, browser_state: any) -> int:
+	"""
+	Store the browser state summary ACT fetched after executing actions
+
+	Args:
+		session_id: Session identifier
+		browser_state: BrowserStateSummary instance
+
+	Returns:
+		Monotonic DOM version to pass through state instead of the browser state itself
+	"""
+	previous = _BROWSER_STATE_CACHE.get(session_id)
+	dom_version = previous[0] + 1 if previous else 1
+	_BROWSER_STATE_CACHE[session_id] = (dom_version, browser_state)
+	return dom_version
+
+
+def get_cached_browser_state(session_id: str, dom_version: Optional[int]) -> Optional[any]:
+	"""
+	Retrieve the browser state summary ACT cached for a session
+
+	Args:
+		session_id: Session identifier
+		dom_version: DOM version from graph state
+
+	Returns:
+		BrowserStateSummary, or None if missing or the version does not match
+	"""
+	cached = _BROWSER_STATE_CACHE.get(session_id)
+	if cached is None or dom_version is None or cached[0] != dom_version:
+		return None
+	return cached[1]
+
+
+def cache_file_system(session_id: str, file_system: any, file_system_state: any) -> None:
+	"""
+	Store the FileSystem instance for a session
+
+	Args:
+		session_id: Session identifier
+		file_system: FileSystem instance
+		file_system_state: State just emitted by file_system.get_state()
+	"""
+	_FILE_SYSTEM_CACHE[session_id] = (file_system, file_system_state)
+
+
+def get_cached_file_system(session_id: str, file_system_state: any) -> Optional[any]:
+	"""
+	Retrieve the cached FileSystem for a session if it is still in sync with state
+
+	Args:
+		session_id: Session identifier
+		file_system_state: FileSystemState currently held in graph state
+
+	Returns:
+		FileSystem instance, or None if missing or state has changed since it was cached
+	"""
+	cached = _FILE_SYSTEM_CACHE.get(session_id)
+	if cached is None:
+		return None
+	file_system, cached_state = cached
+	if cached_state is not file_system_state and cached_state != file_system_state:
+		return None
+	return file_system
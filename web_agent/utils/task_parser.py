@@ -126,14 +126,9 @@ def create_todo_md_content(task: str, steps: Optional[List[str]] = None) -> str:
         return f"# Task\n\n- [ ] {task}\n"
     
     # Build todo.md content
-    content = "# Task Progress\n\n"
-    content += f"## Goal\n{task}\n\n"
-    content += "## Steps\n\n"
-    
-    for i, step in enumerate(steps, 1):
-        content += f"- [ ] {step}\n"
-    
-    return content
+    parts = ["# Task Progress\n\n", f"## Goal\n{task}\n\n", "## Steps\n\n"]
+    parts.extend(f"- [ ] {step}\n" for step in steps)
+    return "".join(parts)
 
 
 def match_action_to_todo_step(action_type: str, action_params: Dict, todo_steps: List[str]) -> Optional[int]: